@@ -21,31 +21,81 @@ THE SOFTWARE.
 
 """
 
+__version__ = "1.4.1"
+
+from urllib.request import Request, urlopen, getproxies
+from urllib.parse import urlencode
+from urllib.error import HTTPError, URLError
+
+import threading
+import warnings
+
+import json
+
+# orjson and simdjson parse straight from the raw response bytes and are considerably
+# faster than the stdlib decoder on the large documents TextRazor can return.
 try:
-    from urllib2 import Request, urlopen, HTTPError
-    from urllib import urlencode
+    from orjson import loads as _json_loads
 except ImportError:
-    from urllib.request import Request, urlopen
-    from urllib.parse import urlencode
-    from urllib.error import HTTPError
+    try:
+        import simdjson
 
-import warnings
+        # A simdjson parser reuses its internal buffers from one document to the next, but
+        # can't be used from two threads at once, so each thread keeps its own.
+        _simdjson_local = threading.local()
+
+        def _json_loads(data):
+            parser = getattr(_simdjson_local, "parser", None)
+            if parser is None:
+                parser = _simdjson_local.parser = simdjson.Parser()
+
+            # The annotation classes keep and update the response dicts, so have simdjson
+            # build plain Python objects rather than its own read-only proxies.
+            return parser.parse(data, True)
+    except ImportError:
+        def _json_loads(data):
+            return json.loads(data.decode("utf-8"))
+
+# Dictionary entries and classifier categories can make for large request bodies too.
+try:
+    from orjson import dumps as _orjson_dumps, OPT_PASSTHROUGH_DATACLASS, OPT_PASSTHROUGH_DATETIME, OPT_PASSTHROUGH_SUBCLASS
+
+    # orjson refuses anything that isn't plain JSON types, which is then left to the stdlib below.
+    _ORJSON_DUMPS_OPTIONS = OPT_PASSTHROUGH_DATACLASS | OPT_PASSTHROUGH_DATETIME | OPT_PASSTHROUGH_SUBCLASS
+except ImportError:
+    _orjson_dumps = None
+
+
+def _json_dumps(obj):
+    # Compact, unescaped utf-8 either way.  Whatever orjson won't take (non-str keys, ints over 64
+    # bits, subclasses, dates) goes through json.dumps, so what can be sent, and how its keys are
+    # written, doesn't depend on whether orjson is installed.
+    if _orjson_dumps is not None:
+        try:
+            return _orjson_dumps(obj, option=_ORJSON_DUMPS_OPTIONS)
+        except TypeError:
+            pass
+
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
 try:
-    import simplejson as json
+    import urllib3
 except ImportError:
-    import json
+    urllib3 = None
 
 try:
-    import cStringIO.StringIO as IOStream
+    import deflate
 except ImportError:
-    try:
-        import StringIO.StringIO as IOStream
-    except ImportError:
-        from io import BytesIO as IOStream
+    deflate = None
 
-import gzip
+import types
 import zlib
+from sys import intern
+from collections import defaultdict, OrderedDict
+from itertools import chain, islice
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
 
 # These options don't usually change much within a user's app,
 # for convenience allow them to set global defaults for connection options.
@@ -60,10 +110,95 @@ do_encryption = True
 _SECURE_TEXTRAZOR_ENDPOINT = "https://api.textrazor.com/"
 _TEXTRAZOR_ENDPOINT = "http://api.textrazor.com/"
 
+# Request bodies smaller than this are sent uncompressed, below a kilobyte or so the gzip
+# framing eats most of the saving and it isn't worth the CPU.
+_MIN_COMPRESS_BYTES = 1024
+
+# Only this much of an error response is kept for the exception message.
+_MAX_ERROR_BODY_BYTES = 64 * 1024
+
+# How many requests the bulk methods (analyze_batch, analyze_future) have in flight
+# at once.  Kept low so a large job doesn't use up the account's concurrent request limit.
+_MAX_CONCURRENT_REQUESTS = 4
+
+# Seconds a request waits to connect, or for more of the response, before giving up.  Analyzing
+# a large document can take a while before the first byte comes back.
+_REQUEST_TIMEOUT = 120
+
+# Where urllib3 is available, requests share a pool of keep-alive connections so that
+# repeated calls don't each pay for a new TCP connection and TLS handshake.  Failures to
+# connect are retried briefly, urllib3 won't resend a POST that has already gone out.  The pool
+# doesn't pick up proxy settings from the environment, so when any are set requests are left to
+# urllib, which does.  That's decided on the first request, see reset_connection_pool.
+_connection_pool = None
+_connection_pool_checked = False
+_connection_pool_lock = threading.Lock()
+
+
+def _get_connection_pool():
+    global _connection_pool, _connection_pool_checked
+
+    if _connection_pool_checked:
+        return _connection_pool
+
+    with _connection_pool_lock:
+        if not _connection_pool_checked:
+            if urllib3 is not None and not getproxies():
+                _connection_pool = urllib3.PoolManager(maxsize=16, retries=urllib3.Retry(total=2, backoff_factor=0.1))
+            _connection_pool_checked = True
+        return _connection_pool
+
+
+def reset_connection_pool():
+    """Closes the keep-alive connections shared by all clients.  The proxy settings in the environment
+    are looked at again on the next request, call this after setting a proxy (HTTPS_PROXY and the
+    like) once requests have already been made."""
+    global _connection_pool, _connection_pool_checked
+
+    with _connection_pool_lock:
+        if _connection_pool is not None:
+            _connection_pool.clear()
+        _connection_pool = None
+        _connection_pool_checked = False
 
-def _chunks(l, n):
+
+def _compress(data, level=6):
+    """Gzips a request body, with libdeflate when it's installed as it's considerably faster than zlib."""
+    if deflate is not None:
+        return deflate.gzip_compress(data, level)
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _read_response(response, chunk_size=128 * 1024):
+    """Reads a response body, decompressing it chunk by chunk as it arrives if it's gzipped.
+
+    JSON never starts with the gzip magic bytes, so those tell us whether the body is compressed
+    without having to look at the response headers."""
+    chunks = iter(lambda: response.read(chunk_size), b"")
+
+    first_chunk = next(chunks, b"")
+    if not first_chunk.startswith(b"\x1f\x8b"):
+        return b"".join((first_chunk, response.read()))
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    # Inflate into one growing buffer rather than joining a list of pieces at the end, which
+    # would briefly hold two copies of the body.  All the JSON decoders accept a bytearray.
+    body = bytearray(decompressor.decompress(first_chunk))
+    for chunk in chunks:
+        body += decompressor.decompress(chunk)
+    body += decompressor.flush()
+
+    return body
+
+
+def _chunks(iterable, n):
     n = max(1, n)
-    return (l[i:i + n] for i in range(0, len(l), n))
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, n)):
+        yield batch
 
 
 class proxy_response_json(object):
@@ -86,6 +221,18 @@ class proxy_response_json(object):
         instance.json[self.attr_name] = value
 
 
+class proxy_response_json_mutable(proxy_response_json):
+    """ proxy_response_json for fields with a list or dict default.  A missing field gets its own
+    empty value stored in the json the first time it's read, so changes made to it in place stay
+    with the json instead of going to a default shared by every instance. """
+
+    def __get__(self, instance, owner=None):
+        try:
+            return instance.json[self.attr_name]
+        except KeyError:
+            return instance.json.setdefault(self.attr_name, type(self.default)())
+
+
 class proxy_member(object):
     """ Slightly redundant given the property decorator, but saves some space
     and makes non-json property access consistent with the above. """
@@ -99,22 +246,179 @@ class proxy_member(object):
     def __get__(self, instance, owner=None):
         return getattr(instance, self.attr_name)
 
-def _generate_str(instance, banned_properties=[]):
-    out = ["TextRazor", type(instance).__name__]
+
+class proxy_links(proxy_member):
+    """ proxy_member for a list of links that is left as the shared _NO_LINKS
+    until the first link is added, still handing callers an empty list. """
+
+    def __get__(self, instance, owner=None):
+        return getattr(instance, self.attr_name) or []
+
+
+# Placeholder for link lists nothing has been added to yet, see proxy_links.
+_NO_LINKS = ()
+
+_STR_FIELD_TYPES = (proxy_response_json, proxy_member, property, types.MemberDescriptorType)
+
+# Left out of every __str__, classes can add their own names with a _str_skip frozenset.
+_STR_SKIP = frozenset(("id", "json"))
+
+# The printable properties of each class never change, so they are collected once per
+# class rather than by calling dir() on every instance that gets printed.  Each entry is the
+# sorted field names and the names the class leaves out.
+_str_fields = {}
+
+
+def _get_str_fields(cls):
+    try:
+        return _str_fields[cls]
+    except KeyError:
+        pass
+
+    skip = _STR_SKIP.union(getattr(cls, "_str_skip", ()))
+
+    names = set()
+    for klass in cls.__mro__:
+        for name, obj in vars(klass).items():
+            if isinstance(obj, _STR_FIELD_TYPES) and not name.startswith("_") and name not in skip:
+                names.add(name)
+
+    fields = _str_fields[cls] = (tuple(sorted(names)), skip)
+    return fields
+
+
+def _generate_str(instance):
+    name = type(instance).__name__
 
     try:
-        out.extend(["with id:", repr(instance.id), "\n"])
+        out = [f"TextRazor {name} with id: {instance.id!r} \n"]
     except AttributeError:
-        out.extend([":\n", ])
+        out = [f"TextRazor {name} :\n"]
 
-    for prop in dir(instance):
-        if not prop.startswith("_") and prop != "id" and prop not in banned_properties:
-            out.extend([prop, ":", repr(getattr(instance, prop)), "\n"])
+    fields, skip = _get_str_fields(type(instance))
+
+    # Custom annotations attach the rules that matched to each instance's __dict__.
+    instance_dict = getattr(instance, "__dict__", None)
+    if instance_dict:
+        fields = sorted(set(fields).union(name for name in instance_dict if not name.startswith("_") and name not in skip))
+
+    out.extend(f" {prop} : {getattr(instance, prop)!r} \n" for prop in fields)
+
+    return "".join(out)
+
+
+# What quote_plus turns each byte into, indexed by byte value.  Decoding as latin-1 maps every
+# byte to the character with the same ordinal, so str.translate can run the whole table in C
+# in one pass, rather than quote_plus mapping its quoter over the bytes and joining the pieces.
+_QUOTE_PLUS_SAFE = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~")
+_QUOTE_PLUS_TABLE = [chr(byte) if byte in _QUOTE_PLUS_SAFE else "%%%02X" % byte for byte in range(256)]
+_QUOTE_PLUS_TABLE[ord(" ")] = "+"
+
+
+def _quote_plus(text):
+    # Same output as quote_plus(text).encode("ascii"), text may also be utf-8 bytes.  ASCII text
+    # is its own utf-8, so it can be translated as is, without the round trip through bytes.
+    if isinstance(text, str):
+        if text.isascii():
+            return text.translate(_QUOTE_PLUS_TABLE).encode("ascii")
+
+        text = text.encode("utf-8")
+
+    return text.decode("latin-1").translate(_QUOTE_PLUS_TABLE).encode("ascii")
+
+
+# Runs the requests behind analyze_future and analyze_url_future, created on first use.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_REQUESTS, thread_name_prefix="textrazor")
+        return _executor
+
+
+def _map_concurrently(function, items, max_workers):
+    # Calls function on each item from a small thread pool, for independent requests that would
+    # otherwise each wait out a full round trip in turn.  Results come back in the order of
+    # items.  As soon as any call raises, the items not yet started are cancelled, and the first
+    # exception in item order is raised.
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [function(item) for item in items]
+
+    def cancel_rest(future):
+        if not future.cancelled() and future.exception() is not None:
+            for other in futures:
+                other.cancel()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(function, item) for item in items]
+        for future in futures:
+            future.add_done_callback(cancel_rest)
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def _paging_query(limit, offset):
+    # The _all listings only ever take these two integers, so there's nothing for urlencode to do.
+    if limit and offset:
+        return f"?limit={int(limit)}&offset={int(offset)}"
+    if limit:
+        return f"?limit={int(limit)}"
+    if offset:
+        return f"?offset={int(offset)}"
+    return ""
+
+
+def _raise_for_error(response, message, *args):
+    # Manager requests report failure with "ok": false and the reason in "error".  The message is
+    # only formatted once something has gone wrong, and with the server's error string rather
+    # than the whole response, which can be a large document.
+    if response.get("ok", True):
+        return
+
+    raise TextRazorAnalysisException(message % (args + (response.get("error") or str(response),)))
+
+
+# The settable fields of the request classes, mapped to their JSON keys and collected once per
+# class.  Kept in declared order for error messages.
+_proxy_fields = {}
+
+
+def _get_proxy_fields(cls):
+    try:
+        return _proxy_fields[cls]
+    except KeyError:
+        pass
+
+    fields = _proxy_fields[cls] = {name: obj.attr_name for name, obj in cls.__dict__.items() if isinstance(obj, proxy_response_json)}
+    return fields
+
+
+def _to_request_json(cls, properties, description):
+    # Translates a dict of cls property names to the JSON cls wraps, without going through
+    # its descriptors one key at a time.
+    fields = _get_proxy_fields(cls)
+
+    try:
+        return {fields[key]: value for key, value in properties.items()}
+    except KeyError as e:
+        raise TextRazorAnalysisException("Cannot create %s, unexpected param: %s. Supported params: %s" % (description, e.args[0], ",".join(fields))) from None
 
-    return " ".join(out)
 
 class TextRazorConnection(object):
 
+    # Cleared if TextRazor (or a proxy in front of it) rejects a gzipped request body.
+    _compress_requests = True
+
     def __init__(self, local_api_key=None, local_do_compression=None, local_do_encryption=None):
         global api_key, do_compression, do_encryption, _TEXTRAZOR_ENDPOINT, _SECURE_TEXTRAZOR_ENDPOINT
 
@@ -166,6 +470,9 @@ class TextRazorConnection(object):
         return request_headers
 
     def do_request(self, path, post_data=None, content_type=None, method="GET"):
+        return _json_loads(self._request_body(path, post_data, content_type, method))
+
+    def _request_body(self, path, post_data=None, content_type=None, method="GET"):
         # Where compression is enabled, TextRazor supports compression of both request and response bodys.
         # Request compression can result in a significant decrease in processing time, especially for
         # larger documents.
@@ -173,58 +480,97 @@ class TextRazorConnection(object):
 
         encoded_post_data = None
         if post_data:
-            encoded_post_data = post_data.encode("utf-8")
+            if isinstance(post_data, bytes):
+                encoded_post_data = post_data
+            else:
+                encoded_post_data = post_data.encode("utf-8")
 
             # Don't do request compression for small/empty bodies
-            do_request_compression = self.do_compression and encoded_post_data and len(encoded_post_data) > 50
+            do_request_compression = self.do_compression and self._compress_requests and len(encoded_post_data) >= _MIN_COMPRESS_BYTES
 
         request_headers = self._build_request_headers(do_request_compression)
 
         if content_type:
             request_headers['Content-Type'] = content_type
+        elif encoded_post_data:
+            request_headers['Content-Type'] = 'application/x-www-form-urlencoded'
 
         if self.do_encryption:
             endpoint = self.secure_endpoint
         else:
             endpoint = self.endpoint
 
-        url = "".join([endpoint, path])
+        url = endpoint + path
 
         if do_request_compression:
-            encoded_post_data = zlib.compress(encoded_post_data)
+            try:
+                return self._send_request(method, url, _compress(encoded_post_data), request_headers)
+            except TextRazorHTTPException as e:
+                if e.http_code != 415:
+                    raise
+
+            # Something between us and TextRazor won't take gzipped bodies, send this one again
+            # uncompressed and stop compressing requests on this connection.
+            self._compress_requests = False
+            del request_headers['Content-Encoding']
+
+        return self._send_request(method, url, encoded_post_data, request_headers)
+
+    def _send_request(self, method, url, encoded_post_data, request_headers):
+        connection_pool = _get_connection_pool()
+        if connection_pool is not None:
+            try:
+                response = connection_pool.request(method, url, body=encoded_post_data, headers=request_headers, timeout=_REQUEST_TIMEOUT)
+            except urllib3.exceptions.HTTPError as e:
+                # Fail the same way as urlopen does when TextRazor can't be reached.
+                raise URLError(e) from e
+
+            if response.status >= 400:
+                raise TextRazorHTTPException(response.status, response.data[:_MAX_ERROR_BODY_BYTES])
+
+            return response.data
 
         request = Request(url, headers=request_headers, data=encoded_post_data)
 
         request.get_method = lambda: method
 
         try:
-            response = urlopen(request)
+            response = urlopen(request, timeout=_REQUEST_TIMEOUT)
         except HTTPError as e:
-            raise TextRazorAnalysisException("TextRazor returned HTTP Code %d: %s" % (e.code, e.read()))
-
-        if response.info().get('Content-Encoding') == 'gzip':
-            buf = IOStream(response.read())
-            response = gzip.GzipFile(fileobj=buf)
+            raise TextRazorHTTPException(e.code, e.read(_MAX_ERROR_BODY_BYTES))
 
-        response_text = response.read().decode("utf-8")
-        return json.loads(response_text)
+        return _read_response(response)
 
 
 class TextRazorAnalysisException(Exception):
     pass
 
 
+class TextRazorHTTPException(TextRazorAnalysisException):
+    """Raised when TextRazor responds with an HTTP error.  http_code holds the status, and body_preview
+    the start of the response body, which usually explains the problem."""
+
+    def __init__(self, http_code, body_preview):
+        super(TextRazorHTTPException, self).__init__(http_code, body_preview)
+        self.http_code = http_code
+        self.body_preview = body_preview
+
+    def __str__(self):
+        return "TextRazor returned HTTP Code %d: %s" % (self.http_code, self.body_preview)
+
+
 class Topic(object):
     """Represents a single abstract topic extracted from the input text.
 
     Requires the "topics" extractor to be added to the TextRazor request.
     """
 
-    def __init__(self, topic_json, link_index):
-        self.json = topic_json
+    # Custom annotations attach the rules that matched an annotation to it by name, so every
+    # class they can link to keeps a __dict__ slot for those, alongside the fixed slots.
+    __slots__ = ("json", "__dict__")
 
-        for callback, arg in link_index.get(("topic", self.id), []):
-            callback(arg, self)
+    def __init__(self, topic_json):
+        self.json = topic_json
 
     id = proxy_response_json("id", None, """The unique id of this Topic within the result set.""")
 
@@ -249,22 +595,18 @@ class Entity(object):
     Requires the "entities" extractor to be added to the TextRazor request.
     """
 
-    def __init__(self, entity_json, link_index):
+    __slots__ = ("json", "_matched_words", "__dict__")
+
+    def __init__(self, entity_json):
         self.json = entity_json
         self._matched_words = []
 
-        for callback, arg in link_index.get(("entity", self.document_id), []):
-            callback(arg, self)
-
-        for position in self.matched_positions:
-            try:
-                link_index[("word", position)].append((self._register_link, None))
-            except KeyError:
-                link_index[("word", position)] = [(self._register_link, None)]
-
-    def _register_link(self, dummy, word):
-        self._matched_words.append(word)
-        word._add_entity(self)
+        # The same handful of types are shared by many entities.  The strings are swapped for equal
+        # interned ones in place, so the lists stay the ones in the json.
+        for key in ("freebaseTypes", "type"):
+            types = entity_json.get(key)
+            if types:
+                types[:] = map(intern, types)
 
     custom_entity_id = proxy_response_json("customEntityId", "", """
     The custom entity DictionaryEntry id that matched this Entity,
@@ -288,11 +630,11 @@ class Entity(object):
 
     ending_position = proxy_response_json("endingPos", None, "The character offset in the unicode source text that marks the end of this entity.")
 
-    matched_positions = proxy_response_json("matchingTokens", [], "List of the token positions in the current sentence that make up this entity.")
+    matched_positions = proxy_response_json_mutable("matchingTokens", [], "List of the token positions in the current sentence that make up this entity.")
 
-    freebase_types = proxy_response_json("freebaseTypes", [], "List of Freebase types for this entity, or an empty list if there are none.")
+    freebase_types = proxy_response_json_mutable("freebaseTypes", [], "List of Freebase types for this entity, or an empty list if there are none.")
 
-    dbpedia_types = proxy_response_json("type", [], "List of Dbpedia types for this entity, or an empty list if there are none.")
+    dbpedia_types = proxy_response_json_mutable("type", [], "List of Dbpedia types for this entity, or an empty list if there are none.")
 
     relevance_score = proxy_response_json("relevanceScore", None, """The relevance this entity has to the source text. This is a float on a scale of 0 to 1, with 1 being the most relevant.
     Relevance is computed using a number contextual clues found in the entity context and facts in the TextRazor knowledgebase.""")
@@ -305,7 +647,7 @@ class Entity(object):
     and other web datasets. The score ranges from 0.5 to 10, with 10 representing the highest confidence that this is
     a valid entity.""")
 
-    data = proxy_response_json("data", {}, """Dictionary containing enriched data found for this entity.
+    data = proxy_response_json_mutable("data", {}, """Dictionary containing enriched data found for this entity.
     This is either as a result of an enrichment query, or as uploaded as part of a custom Entity Dictionary.""")
 
     crunchbase_id = proxy_response_json("crunchbaseId", None, "The disambiguated Crunchbase ID for this entity. None if either the entity could not be linked, or the entity was not a Company type.")
@@ -316,13 +658,21 @@ class Entity(object):
 
     permid = proxy_response_json("permid", None, "The disambiguated Thomson Reuters Open PermID for this entity. None if either the entity could not be linked, or the entity was not a Company type.")
 
+    def _link_words(self, words_by_position):
+        self._matched_words = [word for word in map(words_by_position.get, self.matched_positions) if word is not None]
+        for word in self._matched_words:
+            if word._entities:
+                word._entities.append(self)
+            else:
+                word._entities = [self]
+
     @property
     def matched_words(self):
         """Returns a list of :class:`Word` that make up this entity."""
         return self._matched_words
 
     def __repr__(self):
-        return "TextRazor Entity %s at positions %s" % (self.id.encode("utf-8"), str(self.matched_positions))
+        return f"TextRazor Entity {self.id} at positions {self.matched_positions}"
 
     def __str__(self):
         return _generate_str(self)
@@ -333,22 +683,19 @@ class Entailment(object):
     Requires the "entailments" extractor to be added to the TextRazor request.
     """
 
-    def __init__(self, entailment_json, link_index):
+    __slots__ = ("json", "_matched_words", "__dict__")
+
+    def __init__(self, entailment_json):
         self.json = entailment_json
         self._matched_words = []
 
-        for callback, arg in link_index.get(("entailment", self.id), []):
-            callback(arg, self)
-
-        for position in self.matched_positions:
-            try:
-                link_index[("word", position)].append((self._register_link, None))
-            except KeyError:
-                link_index[("word", position)] = [(self._register_link, None)]
-
-    def _register_link(self, dummy, word):
-        self._matched_words.append(word)
-        word._add_entailment(self)
+    def _link_words(self, words_by_position):
+        self._matched_words = [word for word in map(words_by_position.get, self.matched_positions) if word is not None]
+        for word in self._matched_words:
+            if word._entailments:
+                word._entailments.append(self)
+            else:
+                word._entailments = [self]
 
     id = proxy_response_json("id", None, "The unique id of this Entailment within the result set.")
 
@@ -384,20 +731,24 @@ class RelationParam(object):
 
     Requires the "relations" extractor to be added to the TextRazor request."""
 
-    def __init__(self, param_json, relation_parent, link_index):
+    __slots__ = ("json", "_relation_parent", "_param_words")
+
+    def __init__(self, param_json, relation_parent):
         self.json = param_json
         self._relation_parent = relation_parent
         self._param_words = []
 
-        for position in self.param_positions:
-            try:
-                link_index[("word", position)].append((self._register_link, None))
-            except KeyError:
-                link_index[("word", position)] = [(self._register_link, None)]
+        relation = param_json.get("relation")
+        if relation is not None:
+            param_json["relation"] = intern(relation)
 
-    def _register_link(self, dummy, word):
-        self._param_words.append(word)
-        word._add_relation_param(self)
+    def _link_words(self, words_by_position):
+        self._param_words = [word for word in map(words_by_position.get, self.param_positions) if word is not None]
+        for word in self._param_words:
+            if word._relation_params:
+                word._relation_params.append(self)
+            else:
+                word._relation_params = [self]
 
     @property
     def relation_parent(self):
@@ -417,12 +768,7 @@ class RelationParam(object):
 
     def entities(self):
         """Returns a generator of all :class:`Entity` mentioned in this param."""
-        seen = set()
-        for word in self.param_words:
-            for entity in word.entities:
-                if entity not in seen:
-                    seen.add(entity)
-                    yield entity
+        yield from dict.fromkeys(entity for word in self._param_words for entity in word._entities)
 
     def __repr__(self):
         return "TextRazor RelationParam:\"%s\" at positions %s" % (str(self.relation), str(self.param_words))
@@ -436,22 +782,21 @@ class NounPhrase(object):
 
     Requires the "relations" extractor to be added to the TextRazor request."""
 
-    def __init__(self, noun_phrase_json, link_index):
-        self.json = noun_phrase_json
-        self._words = []
+    __slots__ = ("json", "_words", "__dict__")
 
-        for callback, arg in link_index.get(("nounPhrase", self.id), []):
-            callback(arg, self)
+    _str_skip = frozenset(("word_positions",))
 
-        for position in self.word_positions:
-            try:
-                link_index[("word", position)].append((self._register_link, None))
-            except KeyError:
-                link_index[("word", position)] = [(self._register_link, None)]
+    def __init__(self, noun_phrase_json):
+        self.json = noun_phrase_json
+        self._words = []
 
-    def _register_link(self, dummy, word):
-        self._words.append(word)
-        word._add_noun_phrase(self)
+    def _link_words(self, words_by_position):
+        self._words = [word for word in map(words_by_position.get, self.word_positions) if word is not None]
+        for word in self._words:
+            if word._noun_phrases:
+                word._noun_phrases.append(self)
+            else:
+                word._noun_phrases = [self]
 
     id = proxy_response_json("id", None, "The unique id of this NounPhrase within the result set.")
 
@@ -466,7 +811,7 @@ class NounPhrase(object):
         return "TextRazor NounPhrase at positions %s" % (str(self.words))
 
     def __str__(self):
-        return _generate_str(self, banned_properties=["word_positions", ])
+        return _generate_str(self)
 
 class Property(object):
     """Represents a property relation extracted from raw text.  A property implies an "is-a" or "has-a" relationship
@@ -475,33 +820,29 @@ class Property(object):
     Requires the "relations" extractor to be added to the TextRazor request.
     """
 
-    def __init__(self, property_json, link_index):
+    __slots__ = ("json", "_predicate_words", "_property_words", "__dict__")
+
+    _str_skip = frozenset(("predicate_positions",))
+
+    def __init__(self, property_json):
         self.json = property_json
         self._predicate_words = []
         self._property_words = []
 
-        for callback, arg in link_index.get(("property", self.id), []):
-            callback(arg, self)
-
-        for position in self.predicate_positions:
-            try:
-                link_index[("word", position)].append((self._register_link, True))
-            except KeyError:
-                link_index[("word", position)] = [(self._register_link, True)]
-
-        for position in self.property_positions:
-            try:
-                link_index[("word", position)].append((self._register_link, False))
-            except KeyError:
-                link_index[("word", position)] = [(self._register_link, False)]
-
-    def _register_link(self, is_predicate, word):
-        if is_predicate:
-            self._predicate_words.append(word)
-            word._add_property_predicate(self)
-        else:
-            self._property_words.append(word)
-            word._add_property_properties(self)
+    def _link_words(self, words_by_position):
+        self._predicate_words = [word for word in map(words_by_position.get, self.predicate_positions) if word is not None]
+        for word in self._predicate_words:
+            if word._property_predicates:
+                word._property_predicates.append(self)
+            else:
+                word._property_predicates = [self]
+
+        self._property_words = [word for word in map(words_by_position.get, self.property_positions) if word is not None]
+        for word in self._property_words:
+            if word._property_properties:
+                word._property_properties.append(self)
+            else:
+                word._property_properties = [self]
 
     id = proxy_response_json("id", None, "The unique id of this NounPhrase within the result set.")
 
@@ -517,7 +858,7 @@ class Property(object):
         return "TextRazor Property at positions %s" % (str(self.predicate_positions))
 
     def __str__(self):
-        return _generate_str(self, banned_properties=["predicate_positions", ])
+        return _generate_str(self)
 
 class Relation(object):
     """Represents a grammatical relation between words.  Typically owns a number of
@@ -525,24 +866,26 @@ class Relation(object):
 
     Requires the "relations" extractor to be added to the TextRazor request."""
 
-    def __init__(self, relation_json, link_index):
+    __slots__ = ("json", "_params", "_predicate_words", "__dict__")
+
+    _str_skip = frozenset(("predicate_positions",))
+
+    def __init__(self, relation_json):
         self.json = relation_json
 
-        self._params = [RelationParam(param, self, link_index) for param in relation_json["params"]]
+        self._params = [RelationParam(param, self) for param in relation_json["params"]]
         self._predicate_words = []
 
-        for callback, arg in link_index.get(("relation", self.id), []):
-            callback(arg, self)
-
-        for position in self.predicate_positions:
-            try:
-                link_index[("word", position)].append((self._register_link, None))
-            except KeyError:
-                link_index[("word", position)] = [(self._register_link, None)]
+    def _link_words(self, words_by_position):
+        for param in self._params:
+            param._link_words(words_by_position)
 
-    def _register_link(self, dummy, word):
-        self._predicate_words.append(word)
-        word._add_relation(self)
+        self._predicate_words = [word for word in map(words_by_position.get, self.predicate_positions) if word is not None]
+        for word in self._predicate_words:
+            if word._relations:
+                word._relations.append(self)
+            else:
+                word._relations = [self]
 
     id = proxy_response_json("id", None, "The unique id of this Relation within the result set.")
 
@@ -556,58 +899,52 @@ class Relation(object):
         return "TextRazor Relation at positions %s" % (str(self.predicate_words))
 
     def __str__(self):
-        return _generate_str(self, banned_properties=["predicate_positions", ])
+        return _generate_str(self)
 
 class Word(object):
     """Represents a single Word (token) extracted by TextRazor.
 
     Requires the "words" extractor to be added to the TextRazor request."""
 
-    def __init__(self, response_word, link_index):
+    __slots__ = ("json", "_parent", "_children", "_entities", "_entailments", "_relations",
+                 "_relation_params", "_property_predicates", "_property_properties", "_noun_phrases", "__dict__")
+
+    def __init__(self, response_word):
         self.json = response_word
 
         self._parent = None
-        self._children = []
-
-        self._entities = []
-        self._entailments = []
-        self._relations = []
-        self._relation_params = []
-        self._property_predicates = []
-        self._property_properties = []
-        self._noun_phrases = []
 
-        for callback, arg in link_index.get(("word", self.position), []):
-            callback(arg, self)
+        # Most words only take part in a few kinds of annotation, so the link lists start out
+        # empty and shared, and are only allocated when something is linked to the word.
+        self._children = _NO_LINKS
+        self._entities = _NO_LINKS
+        self._entailments = _NO_LINKS
+        self._relations = _NO_LINKS
+        self._relation_params = _NO_LINKS
+        self._property_predicates = _NO_LINKS
+        self._property_properties = _NO_LINKS
+        self._noun_phrases = _NO_LINKS
+
+        # Tags and dependency labels repeat across every word in a response, keep one shared
+        # copy of each rather than a separate string per word.
+        part_of_speech = response_word.get("partOfSpeech")
+        if part_of_speech is not None:
+            response_word["partOfSpeech"] = intern(part_of_speech)
+
+        relation_to_parent = response_word.get("relationToParent")
+        if relation_to_parent is not None:
+            response_word["relationToParent"] = intern(relation_to_parent)
 
     def _add_child(self, child):
-        self._children.append(child)
+        if self._children:
+            self._children.append(child)
+        else:
+            self._children = [child]
 
     def _set_parent(self, parent):
         self._parent = parent
         parent._add_child(self)
 
-    def _add_entity(self, entity):
-        self._entities.append(entity)
-
-    def _add_entailment(self, entailment):
-        self._entailments.append(entailment)
-
-    def _add_relation(self, relation):
-        self._relations.append(relation)
-
-    def _add_relation_param(self, relation_param):
-        self._relation_params.append(relation_param)
-
-    def _add_property_predicate(self, property):
-        self._property_predicates.append(property)
-
-    def _add_property_properties(self, property):
-        self._property_properties.append(property)
-
-    def _add_noun_phrase(self, noun_phrase):
-        self._noun_phrases.append(noun_phrase)
-
     parent_position = proxy_response_json("parentPosition", None, """
     The position of the grammatical parent of this Word, or None if this Word is either at the root
     of the sentence or the "dependency-trees" extractor was not requested.""")
@@ -624,7 +961,7 @@ class Word(object):
 
     http://nlp.stanford.edu/software/dependencies_manual.pdf""")
 
-    children = proxy_member("_children", """
+    children = proxy_links("_children", """
     List of TextRazor words that make up the children of this word.  Returns an empty list
     for leaf words, or if the "dependency-trees" extractor was not requested.""")
 
@@ -650,42 +987,48 @@ class Word(object):
     The end offset in the input text for this token. Note that this offset applies to the
     original Unicode string passed in to the api, TextRazor treats multi byte utf8 charaters as a single position.""")
 
-    entailments = proxy_member("_entailments", "List of :class:`Entailment` that this word entails")
+    entailments = proxy_links("_entailments", "List of :class:`Entailment` that this word entails")
 
-    entities = proxy_member("_entities", "List of :class:`Entity` that this word is a part of.")
+    entities = proxy_links("_entities", "List of :class:`Entity` that this word is a part of.")
 
-    relations = proxy_member("_relations", "List of :class:`Relation` that this word is a predicate of.")
+    relations = proxy_links("_relations", "List of :class:`Relation` that this word is a predicate of.")
 
-    relation_params = proxy_member("_relation_params", "List of :class:`RelationParam` that this word is a member of.")
+    relation_params = proxy_links("_relation_params", "List of :class:`RelationParam` that this word is a member of.")
 
-    property_properties = proxy_member("_property_properties", "List of :class:`Property` that this word is a property member of.")
+    property_properties = proxy_links("_property_properties", "List of :class:`Property` that this word is a property member of.")
 
-    property_predicates = proxy_member("_property_predicates", "List of :class:`Property` that this word is a predicate (or focus) member of.")
+    property_predicates = proxy_links("_property_predicates", "List of :class:`Property` that this word is a predicate (or focus) member of.")
 
-    noun_phrases = proxy_member("_noun_phrases", "List of :class:`NounPhrase` that this word is a member of.")
+    noun_phrases = proxy_links("_noun_phrases", "List of :class:`NounPhrase` that this word is a member of.")
 
     senses = proxy_response_json("senses", [], "List of {'sense', 'score'} dictionaries representing scores of each Wordnet sense this this word may be a part of.")
 
     spelling_suggestions = proxy_response_json("spellingSuggestions", [], "List of {'suggestion', 'score'} dictionaries representing scores of each spelling suggestion that might replace this word. This property requires the \"spelling\" extractor to be sent with your request.")
 
     def __repr__(self):
-        return "TextRazor Word:\"%s\" at position %s" % ((self.token).encode("utf-8"), str(self.position))
+        return f"TextRazor Word:\"{self.token}\" at position {self.position}"
 
     def __str__(self):
         return _generate_str(self)
 
+# Penn Treebank tags for punctuation, which is never attached to a parent in the dependency tree.
+_PUNCTUATION_POS = frozenset(("$", "``", "''", "(", ")", ",", "--", ".", ":"))
+
+
 class Sentence(object):
     """Represents a single sentence extracted by TextRazor."""
 
-    def __init__(self, sentence_json, link_index):
+    __slots__ = ("_words", "_root_word")
+
+    def __init__(self, sentence_json):
         if "words" in sentence_json:
-            self._words = [Word(word_json, link_index) for word_json in sentence_json["words"]]
+            self._words = [Word(word_json) for word_json in sentence_json["words"]]
         else:
             self._words = []
 
-        self._add_links(link_index)
+        self._add_links()
 
-    def _add_links(self, link_index):
+    def _add_links(self):
         if not self._words:
             return
 
@@ -693,15 +1036,15 @@ class Sentence(object):
 
         # Add links between the parent/children of the dependency tree in this sentence.
 
-        word_positions = {}
-        for word in self._words:
-            word_positions[word.position] = word
+        words = self._words
+        word_positions = {word.json.get("position"): word for word in words}
 
-        for word in self._words:
-            parent_position = word.parent_position
+        for word in words:
+            word_json = word.json
+            parent_position = word_json.get("parentPosition")
             if parent_position is not None and parent_position >= 0:
                 word._set_parent(word_positions[parent_position])
-            elif word.part_of_speech not in ("$", "``", "''", "(", ")", ",", "--", ".", ":"):
+            elif word_json.get("partOfSpeech") not in _PUNCTUATION_POS:
                 # Punctuation does not get attached to any parent, any non punctuation part of speech
                 # must be the root word.
                 self._root_word = word
@@ -713,51 +1056,67 @@ class Sentence(object):
 
 class CustomAnnotation(object):
 
-    def __init__(self, annotation_json, link_index):
+    __slots__ = ("json", "_name", "_contents_by_key", "_linked", "_values_by_key")
+
+    def __init__(self, annotation_json):
         self.json = annotation_json
+        self._name = annotation_json["name"]
+
+        # Contents grouped by key, so reading a param doesn't rescan every key/value pair.
+        self._contents_by_key = defaultdict(list)
+
+        # The annotations each link resolved to, kept here rather than in the response JSON so
+        # that the JSON stays plain data.
+        self._linked = {}
+
+        # Each param's values, built on first read.
+        self._values_by_key = {}
 
         for key_value in annotation_json.get("contents", []):
+            if "key" in key_value:
+                self._contents_by_key[key_value["key"]].append(key_value)
+
+    def _link_annotations(self, annotations_by_id):
+        for key_value in self.json.get("contents", []):
             for link in key_value.get("links", []):
-                try:
-                    link_index[(link["annotationName"], link["linkedId"])].append((self._register_link, link))
-                except Exception:
-                    link_index[(link["annotationName"], link["linkedId"])] = [(self._register_link, link)]
+                for annotation in annotations_by_id.get((link["annotationName"], link["linkedId"]), []):
+                    self._register_link(link, annotation)
 
     def _register_link(self, link, annotation):
-        link["linked"] = annotation
+        self._linked[(link["annotationName"], link["linkedId"])] = annotation
+        self._values_by_key.clear()
 
-        new_custom_annotation_list = []
-        try:
-            new_custom_annotation_list = getattr(annotation, self.name())
-        except Exception:
-            pass
-        new_custom_annotation_list.append(self)
-        setattr(annotation, self.name(), new_custom_annotation_list)
+        # Matching rules are exposed as plain attributes of the annotation, named after the rule.
+        annotation.__dict__.setdefault(self._name, []).append(self)
 
     def name(self):
-        return self.json["name"]
+        return self._name
 
     def __getattr__(self, attr):
-        exists = False
-        for key_value in self.json["contents"]:
-            if "key" in key_value and key_value["key"] == attr:
-                exists = True
-                for link in key_value.get("links", []):
-                    try:
-                        yield link["linked"]
-                    except Exception:
-                        yield link
-                for int_value in key_value.get("intValue", []):
-                    yield int_value
-                for float_value in key_value.get("floatValue", []):
-                    yield float_value
-                for str_value in key_value.get("stringValue", []):
-                    yield str_value
-                for bytes_value in key_value.get("bytesValue", []):
-                    yield bytes_value
-
-        if not exists:
-            raise AttributeError("%r annotation has no attribute %r" % (self.name(), attr))
+        # Private names are never param keys, and they're looked up before __init__ has run
+        # (e.g. when copying or unpickling).
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+
+        try:
+            values = self._values_by_key[attr]
+        except KeyError:
+            key_values = self._contents_by_key.get(attr)
+
+            if not key_values:
+                raise AttributeError("%r annotation has no attribute %r" % (self._name, attr))
+
+            values = []
+            for key_value in key_values:
+                values.extend(self._linked.get((link.get("annotationName"), link.get("linkedId")), link)
+                              for link in key_value.get("links", []))
+                values.extend(key_value.get("intValue", []))
+                values.extend(key_value.get("floatValue", []))
+                values.extend(key_value.get("stringValue", []))
+                values.extend(key_value.get("bytesValue", []))
+            self._values_by_key[attr] = values
+
+        return iter(values)
 
     def __repr__(self):
         return "TextRazor CustomAnnotation:\"%s\"" % (self.json["name"])
@@ -778,79 +1137,135 @@ class CustomAnnotation(object):
         return " ".join(out)
 
 
+# The annotations that link to each other, with the response key each is parsed from.  Sentences
+# go last, TextRazorResponse uses them to tell whether the group has been built.
+_LINKED_ANNOTATIONS = (
+    ("_custom_annotations", "customAnnotations", CustomAnnotation),
+    ("_entities", "entities", Entity),
+    ("_entailments", "entailments", Entailment),
+    ("_relations", "relations", Relation),
+    ("_properties", "properties", Property),
+    ("_noun_phrases", "nounPhrases", NounPhrase),
+    ("_sentences", "sentences", Sentence),
+)
+
+
 class TextRazorResponse(object):
     """Represents a processed response from TextRazor."""
 
     def __init__(self, response_json):
         self.json = response_json
 
-        self._sentences = []
-        self._custom_annotations = []
-        self._topics = []
-        self._coarse_topics = []
-        self._entities = []
-        self._entailments = []
-        self._relations = []
-        self._properties = []
-        self._noun_phrases = []
-        self._categories = []
+        # The raw annotation lists, looked up once for the lazy accessors below.
+        self._raw = response_json.get("response", {})
+
+        # Annotations are only built when they are first asked for, most callers only look at
+        # one or two of the extractors they requested.  Topics and categories stand on their own,
+        # the rest link to each other (and to the words) so they're built together.
+        self._topics = None
+        self._coarse_topics = None
+        self._categories = None
+
+        self._sentences = None
+        self._custom_annotations = None
+        self._entities = None
+        self._entailments = None
+        self._relations = None
+        self._properties = None
+        self._noun_phrases = None
+        self._custom_annotations_by_name = None
+
+        # Responses can be shared between threads, so the linked annotations are built under a
+        # lock and only marked as linked once they're complete.
+        self._link_lock = threading.Lock()
+        self._is_linked = False
+
+    def _parse(self, key, annotation_class):
+        return [annotation_class(annotation_json) for annotation_json in self._raw.get(key, ())]
+
+    def _ensure_linked(self):
+        if self._is_linked:
+            return
+
+        with self._link_lock:
+            if self._is_linked:
+                return
+
+            for attr, key, annotation_class in _LINKED_ANNOTATIONS:
+                setattr(self, attr, self._parse(key, annotation_class))
+
+            self._custom_annotations_by_name = {}
+            for custom_annotation in self._custom_annotations:
+                self._custom_annotations_by_name.setdefault(custom_annotation._name, []).append(custom_annotation)
 
-        link_index = {}
+            self._link_annotations()
+            self._is_linked = True
 
-        if "response" in self.json:
-            # There's a bit of magic here.  Each annotation registers a callback with the ids and types of annotation
-            # that it is linked to.  When the linked annotation is later parsed it adds the link via the callback.
-            # This means that annotations must be added in order of the dependency between them.
+    def _parse_topics(self, attr, key):
+        # Custom annotations can match topics, in which case the topics are built and linked along
+        # with the other annotations, so they have their results attached before they're handed out.
+        if "customAnnotations" in self._raw:
+            self._ensure_linked()
 
-            if "customAnnotations" in self.json["response"]:
-                self._custom_annotations = [CustomAnnotation(json, link_index) for json in self.json["response"]["customAnnotations"]]
+        with self._link_lock:
+            if getattr(self, attr) is None:
+                setattr(self, attr, self._parse(key, Topic))
 
-            if "topics" in self.json["response"]:
-                self._topics = [Topic(topic_json, link_index) for topic_json in self.json["response"]["topics"]]
+    def _link_annotations(self):
+        # Once everything is parsed, resolve the word positions and ids each annotation
+        # refers to with direct lookups against the parsed annotations.
+        words_by_position = {}
+        for sentence in self._sentences:
+            for word in sentence._words:
+                words_by_position[word.json.get("position")] = word
 
-            if "coarseTopics" in self.json["response"]:
-                self._coarse_topics = [Topic(topic_json, link_index) for topic_json in self.json["response"]["coarseTopics"]]
+        for annotations in (self._entities, self._entailments, self._relations, self._properties, self._noun_phrases):
+            for annotation in annotations:
+                annotation._link_words(words_by_position)
 
-            if "entities" in self.json["response"]:
-                self._entities = [Entity(entity_json, link_index) for entity_json in self.json["response"]["entities"]]
+        if not self._custom_annotations:
+            return
 
-            if "entailments" in self.json["response"]:
-                self._entailments = [Entailment(entailment_json, link_index) for entailment_json in self.json["response"]["entailments"]]
+        topics = self._parse("topics", Topic)
+        coarse_topics = self._parse("coarseTopics", Topic)
 
-            if "relations" in self.json["response"]:
-                self._relations = [Relation(relation_json, link_index) for relation_json in self.json["response"]["relations"]]
+        annotations_by_id = defaultdict(list)
+        for name, annotations in (("topic", topics), ("topic", coarse_topics), ("entailment", self._entailments),
+                                  ("relation", self._relations), ("property", self._properties), ("nounPhrase", self._noun_phrases)):
+            for annotation in annotations:
+                annotations_by_id[(name, annotation.id)].append(annotation)
 
-            if "properties" in self.json["response"]:
-                self._properties = [Property(property_json, link_index) for property_json in self.json["response"]["properties"]]
+        for entity in self._entities:
+            annotations_by_id[("entity", entity.document_id)].append(entity)
 
-            if "nounPhrases" in self.json["response"]:
-                self._noun_phrases = [NounPhrase(phrase_json, link_index) for phrase_json in self.json["response"]["nounPhrases"]]
+        for position, word in words_by_position.items():
+            annotations_by_id[("word", position)].append(word)
 
-            if "sentences" in self.json["response"]:
-                self._sentences = [Sentence(sentence_json, link_index) for sentence_json in self.json["response"]["sentences"]]
+        for custom_annotation in self._custom_annotations:
+            custom_annotation._link_annotations(annotations_by_id)
 
-            if "categories" in self.json["response"]:
-                self._categories = [ScoredCategory(category_json) for category_json in self.json["response"]["categories"]]
+        self._topics = topics
+        self._coarse_topics = coarse_topics
 
     @property
     def raw_text(self):
         """"When the set_cleanup_return_raw option is enabled, contains the input text before any cleanup."""
-        return self.json["response"].get("rawText", "")
+        return self._raw.get("rawText", "")
 
     @property
     def cleaned_text(self):
         """"When the set_cleanup_return_cleaned option is enabled, contains the input text after any cleanup/article extraction."""
-        return self.json["response"].get("cleanedText", "")
+        return self._raw.get("cleanedText", "")
 
     @property
     def language(self):
         """"The ISO-639-2 language used to analyze this document, either explicitly provided as the languageOverride, or as detected by the language detector."""
-        return self.json["response"].get("language", "")
+        return self._raw.get("language", "")
 
     @property
     def custom_annotation_output(self):
         """"Any output generated while running the embedded Prolog engine on your rules."""
-        return self.json["response"].get("customAnnotationOutput", "")
+        return self._raw.get("customAnnotationOutput", "")
 
     ok = proxy_response_json("ok", False, """
     True if TextRazor successfully analyzed your document, False if there was some error.
@@ -868,72 +1283,121 @@ class TextRazorResponse(object):
 
     def coarse_topics(self):
         """Returns a list of all the coarse :class:`Topic` in the response. """
+        if self._coarse_topics is None:
+            self._parse_topics("_coarse_topics", "coarseTopics")
         return self._coarse_topics
 
     def topics(self):
         """Returns a list of all the :class:`Topic` in the response. """
+        if self._topics is None:
+            self._parse_topics("_topics", "topics")
         return self._topics
 
     def entities(self):
         """Returns a list of all the :class:`Entity` across all sentences in the response."""
+        self._ensure_linked()
         return self._entities
 
     def words(self):
-        """Returns a generator of all :class:`Word` across all sentences in the response."""
-        for sentence in self._sentences:
-            for word in sentence.words:
-                yield word
+        """Returns an iterator over all :class:`Word` across all sentences in the response."""
+        self._ensure_linked()
+        return chain.from_iterable(sentence._words for sentence in self._sentences)
 
     def entailments(self):
         """Returns a list of all :class:`Entailment` across all sentences in the response."""
+        self._ensure_linked()
         return self._entailments
 
     def relations(self):
         """Returns a list of all :class:`Relation` across all sentences in the response."""
+        self._ensure_linked()
         return self._relations
 
     def properties(self):
         """Returns a list of all :class:`Property` across all sentences in the response."""
+        self._ensure_linked()
         return self._properties
 
     def noun_phrases(self):
         """Returns a list of all the :class:`NounPhrase` across all sentences in the response."""
+        self._ensure_linked()
         return self._noun_phrases
 
+    def __reduce__(self):
+        # Annotations are rebuilt on demand from the JSON, so that's all a pickled response needs.
+        return (TextRazorResponse, (self.json,))
+
     def sentences(self):
         """Returns a list of all :class:`Sentence` in the response."""
+        self._ensure_linked()
         return self._sentences
 
     def categories(self):
         """List of all :class:`ScoredCategory` in the response."""
+        if self._categories is None:
+            self._categories = self._parse("categories", ScoredCategory)
         return self._categories
 
+    def category_scores(self):
+        """Returns the scores, category ids and classifier ids of every :class:`ScoredCategory` in
+        the response as three parallel sequences, without building the ScoredCategory objects.
+
+        Scores are an ``array('d')``, which numpy can wrap without copying:
+
+        >>> scores, category_ids, classifier_ids = response.category_scores()
+        >>> top = numpy.argsort(numpy.frombuffer(scores))[::-1][:10]
+        """
+        categories_json = self._raw.get("categories", ())
+
+        return (array("d", [category_json.get("score", 0) for category_json in categories_json]),
+                [category_json.get("categoryId", "") for category_json in categories_json],
+                [category_json.get("classifierId", "") for category_json in categories_json])
+
     def matching_rules(self):
         """Returns a list of rule names that matched this document."""
-        return [custom_annotation.name() for custom_annotation in self._custom_annotations]
+        self._ensure_linked()
+        return [custom_annotation._name for custom_annotation in self._custom_annotations]
 
     def summary(self):
         return """Request processed in: %s seconds.  Num Sentences:%s""" % (
-            self.json["time"], len(self.json["response"]["sentences"])
+            self.json["time"], len(self._raw["sentences"])
         )
 
     def __getattr__(self, attr):
-        exists = False
-        for custom_annotation in self._custom_annotations:
-            if custom_annotation.name() == attr:
-                exists = True
-                yield custom_annotation
+        # Private names are never rule names, and they're looked up while the response is
+        # still being set up (e.g. when unpickling).
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+
+        self._ensure_linked()
 
-        if not exists:
+        try:
+            return iter(self._custom_annotations_by_name[attr])
+        except KeyError:
             raise AttributeError("TextRazor response has no annotation %r" % attr)
 
 
 class AllDictionaryEntriesResponse(object):
 
+    __slots__ = ("json", "_entries")
+
     def __init__(self, json):
         self.json = json
 
-        self.entries = [DictionaryEntry(dictionary_json) for dictionary_json in json.get("entries", [])]
+        # Wrapped on first access, a page can hold tens of thousands of entries.
+        self._entries = None
+
+    @property
+    def entries(self):
+        """List of the :class:`DictionaryEntry` in this page."""
+        if self._entries is None:
+            self._entries = [DictionaryEntry(dictionary_json) for dictionary_json in self.json.get("entries", [])]
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries):
+        self._entries = list(entries)
+        self.json["entries"] = [entry.json for entry in self._entries]
 
     total = proxy_response_json("total", 0, """
     The total number of DictionaryEntry in this Dictionary.
@@ -965,24 +1429,16 @@ class DictionaryManager(TextRazorConnection):
         >>> dictionary_manager.create_dictionary({"id":"UNIQUE_ID"})
         """
 
-        new_dictionary = Dictionary({})
-
-        for key, value in dictionary_properties.items():
-            if not hasattr(new_dictionary, key):
-                valid_options = ",".join(name for name, obj in Dictionary.__dict__.items() if isinstance(obj, proxy_response_json))
-
-                raise TextRazorAnalysisException("Cannot create dictionary, unexpected param: %s. Supported params: %s" % (key, valid_options))
-
-            setattr(new_dictionary, key, value)
+        new_dictionary = Dictionary(_to_request_json(Dictionary, dictionary_properties, "dictionary"))
 
         # Check for the existence of a dictionary ID, without that
         # we can't generate a URL and the server will return an unhelpful message.
         if not new_dictionary.id:
             raise TextRazorAnalysisException("Cannot create dictionary, dictionary id not provided.")
 
-        dictionary_path = "".join([self.path, new_dictionary.id])
+        dictionary_path = f"{self.path}{new_dictionary.id}"
 
-        self.do_request(dictionary_path, json.dumps(new_dictionary.json), method="PUT")
+        self.do_request(dictionary_path, _json_dumps(new_dictionary.json), method="PUT")
 
         # The server may have added some optional fields so we want to force the user to "get" the new dictionary.
         return self.get_dictionary(new_dictionary.id)
@@ -996,8 +1452,7 @@ class DictionaryManager(TextRazorConnection):
 
         response = self.do_request(self.path)
 
-        if "ok" in response and not response["ok"]:
-            raise TextRazorAnalysisException("TextRazor was unable to retrieve all dictionaries. Error: %s" % str(response))
+        _raise_for_error(response, "TextRazor was unable to retrieve all dictionaries. Error: %s")
 
         if "dictionaries" in response:
             return [Dictionary(dictionary_json) for dictionary_json in response["dictionaries"]]
@@ -1009,11 +1464,10 @@ class DictionaryManager(TextRazorConnection):
 
         >>> print dictionary_manager.get_id("UNIQUE_ID").language
         """
-        dictionary_path = "".join([self.path, id])
+        dictionary_path = f"{self.path}{id}"
         response = self.do_request(dictionary_path, method="GET")
 
-        if "ok" in response and not response["ok"]:
-            raise TextRazorAnalysisException("TextRazor was unable to retrieve dictionary with id: %s. Error: %s" % (id, str(response)))
+        _raise_for_error(response, "TextRazor was unable to retrieve dictionary with id: %s. Error: %s", id)
 
         return Dictionary(response["response"])
 
@@ -1022,11 +1476,10 @@ class DictionaryManager(TextRazorConnection):
 
         >>> dictionary_manager.delete_dictionary("UNIQUE_ID")
         """
-        dictionary_path = "".join([self.path, id])
+        dictionary_path = f"{self.path}{id}"
         response = self.do_request(dictionary_path, method="DELETE")
 
-        if "ok" in response and not response["ok"]:
-            raise TextRazorAnalysisException("Unable to delete dictionary with ID:%s. Error: %s" % (id, str(response)))
+        _raise_for_error(response, "Unable to delete dictionary with ID:%s. Error: %s", id)
 
     def all_entries(self, dictionary_id, limit=None, offset=None):
         """ Returns a AllDictionaryEntriesResponse containing all DictionaryEntry for dictionary with id dictionary_id, along with paging information.
@@ -1039,53 +1492,41 @@ class DictionaryManager(TextRazorConnection):
         >>>     print entry.text
         """
 
-        params = {}
-        if limit:
-            params['limit'] = limit
-        if offset:
-            params['offset'] = offset
+        query = _paging_query(limit, offset)
 
-        all_path = "".join([self.path, dictionary_id, "/_all?", urlencode(params)])
+        all_path = f"{self.path}{dictionary_id}/_all{query}"
 
         response = self.do_request(all_path, method="GET")
 
-        if "ok" in response and not response["ok"]:
-            raise TextRazorAnalysisException("TextRazor was unable to retrieve dictionary entries with dictionary id: %s, Error: %s" % (dictionary_id, str(response)))
+        _raise_for_error(response, "TextRazor was unable to retrieve dictionary entries with dictionary id: %s, Error: %s", dictionary_id)
 
         return AllDictionaryEntriesResponse(response["response"])
 
-    def add_entries(self, dictionary_id, entities):
+    def add_entries(self, dictionary_id, entities, max_workers=1):
         """ Adds entries to a dictionary with id dictionary_id.
 
         Entries must be a List of dicts corresponding to properties of the new DictionaryEntry objects.
         At a minimum this would be [{'text':'test text to match'}].
 
+        Large lists are uploaded in batches, one after another by default, stopping at the first batch
+        that fails.  Set max_workers above 1 to upload that many batches at once.  The batches are
+        then written in no particular order, so an entry id repeated across batches may keep any
+        of its values, and when a batch fails some of the later batches may already have been added.
+
         >>> dictionary_manager.add_entries("UNIQUE_ID", [{'text':'test text to match'}, {'text':'more text to match', 'id':'UNIQUE_ENTRY_ID'}])
         """
-        dictionary_path = "".join([self.path, dictionary_id, "/"])
-        all_entries = []
-
-        for entity in entities:
-            new_entry = DictionaryEntry({})
-
-            for key, value in entity.items():
-                if not hasattr(new_entry, key):
-                    valid_options = ",".join(name for name, obj in DictionaryEntry.__dict__.items() if isinstance(obj, proxy_response_json))
-
-                    raise TextRazorAnalysisException("Cannot create dictionary entry, unexpected param: %s. Supported params: %s" % (key, valid_options))
-
-                setattr(new_entry, key, value)
-
-            all_entries.append(new_entry.json)
+        dictionary_path = f"{self.path}{dictionary_id}/"
+        all_entries = [_to_request_json(DictionaryEntry, entity, "dictionary entry") for entity in entities]
 
         # For performance reasons TextRazor expects a maximum of 20000 dictionary entries at a time,
         # we transparently batch them up here.
+        batches = list(_chunks(all_entries, 20000))
 
-        for batch in _chunks(all_entries, 20000):
-            response = self.do_request(dictionary_path, json.dumps(batch), method="POST")
+        def add_batch(batch):
+            response = self.do_request(dictionary_path, _json_dumps(batch), method="POST")
+            _raise_for_error(response, "Unable to add entries to dictionary with ID:%s. Error: %s", dictionary_id)
 
-            if "ok" in response and not response["ok"]:
-                raise TextRazorAnalysisException("Unable to add entries to dictionary with ID:%s. Error: %s" % (dictionary_id, str(response)))
+        _map_concurrently(add_batch, batches, max_workers)
 
     def delete_entry(self, dictionary_id, entry_id):
         """Deletes a specific DictionaryEntry by dictionary id and entry id.
@@ -1097,12 +1538,11 @@ class DictionaryManager(TextRazorConnection):
         >>> dictionary_manager.delete_entry('UNIQUE_ID', 'UNIQUE_ENTRY_ID')
         """
 
-        dictionary_path = "".join([self.path, dictionary_id, "/", entry_id])
+        dictionary_path = f"{self.path}{dictionary_id}/{entry_id}"
 
         response = self.do_request(dictionary_path, method="DELETE")
 
-        if "ok" in response and not response["ok"]:
-            raise TextRazorAnalysisException("TextRazor was unable to delete dictionary entry with dictionary id: %s, entry id: %s Error: %s" % (dictionary_id, entry_id, str(response)))
+        _raise_for_error(response, "TextRazor was unable to delete dictionary entry with dictionary id: %s, entry id: %s Error: %s", dictionary_id, entry_id)
 
     def get_entry(self, dictionary_id, entry_id):
         """ Retrieves a specific DictionaryEntry by dictionary id and entry id.
@@ -1110,18 +1550,19 @@ class DictionaryManager(TextRazorConnection):
         >>> print dictionary_manager.get_id('UNIQUE_ID', 'UNIQUE_ENTRY_ID').text
         """
 
-        dictionary_path = "".join([self.path, dictionary_id, "/", entry_id])
+        dictionary_path = f"{self.path}{dictionary_id}/{entry_id}"
 
         response = self.do_request(dictionary_path, method="GET")
 
-        if "ok" in response and not response["ok"]:
-            raise TextRazorAnalysisException("TextRazor was unable to retrieve dictionary entry with dictionary id: %s, entry id: %s Error: %s" % (dictionary_id, entry_id, str(response)))
+        _raise_for_error(response, "TextRazor was unable to retrieve dictionary entry with dictionary id: %s, entry id: %s Error: %s", dictionary_id, entry_id)
 
         return DictionaryEntry(response["response"])
 
 
 class DictionaryEntry(object):
 
+    __slots__ = ("json",)
+
     def __init__(self, json):
         self.json = json
 
@@ -1146,6 +1587,8 @@ class DictionaryEntry(object):
 
 class Dictionary(object):
 
+    __slots__ = ("json",)
+
     def __init__(self, json):
         self.json = json
 
@@ -1180,9 +1623,25 @@ class Dictionary(object):
 
 class AllCategoriesResponse(object):
 
+    __slots__ = ("json", "_categories")
+
     def __init__(self, json):
         self.json = json
-        self.categories = [Category(category_json) for category_json in json.get("categories", [])]
+
+        # Wrapped on first access, as with AllDictionaryEntriesResponse.entries.
+        self._categories = None
+
+    @property
+    def categories(self):
+        """List of the :class:`Category` in this page."""
+        if self._categories is None:
+            self._categories = [Category(category_json) for category_json in self.json.get("categories", [])]
+        return self._categories
+
+    @categories.setter
+    def categories(self, categories):
+        self._categories = list(categories)
+        self.json["categories"] = [category.json for category in self._categories]
 
     total = proxy_response_json("total", 0, """
     The total number of Category in this Classifier.
@@ -1199,6 +1658,8 @@ class AllCategoriesResponse(object):
 
 class ScoredCategory(object):
 
+    __slots__ = ("json",)
+
     def __init__(self, json):
         self.json = json
 
@@ -1222,6 +1683,8 @@ class ScoredCategory(object):
 class Category(object):
     path = "categories/"
 
+    __slots__ = ("json",)
+
     def __init__(self, json):
         self.json = json
 
@@ -1241,7 +1704,7 @@ class ClassifierManager(TextRazorConnection):
 
     def delete_classifier(self, classifier_id):
         """ Deletes a Classifier and all its Categories by id. """
-        classifier_path = "".join([self.path, classifier_id])
+        classifier_path = f"{self.path}{classifier_id}"
         self.do_request(classifier_path, method="DELETE")
 
     def create_classifier(self, classifier_id, categories):
@@ -1249,30 +1712,17 @@ class ClassifierManager(TextRazorConnection):
 
         See the properties of class Category for valid options. """
 
-        classifier_path = "".join([self.path, classifier_id])
-
-        all_categories = []
-
-        for category in categories:
-            new_category = Category({})
-
-            for key, value in category.items():
-                if not hasattr(new_category, key):
-                    valid_options = ",".join(name for name, obj in Category.__dict__.items() if isinstance(obj, proxy_response_json))
+        classifier_path = f"{self.path}{classifier_id}"
 
-                    raise TextRazorAnalysisException("Cannot create category, unexpected param: %s. Supported params: %s" % (key, valid_options))
+        all_categories = [_to_request_json(Category, category, "category") for category in categories]
 
-                setattr(new_category, key, value)
-
-            all_categories.append(new_category.json)
-
-        self.do_request(classifier_path, json.dumps(all_categories), content_type="application/json", method="PUT")
+        self.do_request(classifier_path, _json_dumps(all_categories), content_type="application/json", method="PUT")
 
     def create_classifier_with_csv(self, classifier_id, categories_csv):
         """ Uploads the string contents of a CSV file containing new categories to be added to the classifier called classifier_name.
            Any existing classifier with this ID will be replaced. """
 
-        classifier_path = "".join([self.path, classifier_id])
+        classifier_path = f"{self.path}{classifier_id}"
         self.do_request(classifier_path, categories_csv, content_type="application/csv", method="PUT")
 
     def all_categories(self, classifier_id, limit=None, offset=None):
@@ -1286,39 +1736,35 @@ class ClassifierManager(TextRazorConnection):
         >>>     print category.text
         """
 
-        params = {}
-        if limit:
-            params['limit'] = limit
-        if offset:
-            params['offset'] = offset
+        query = _paging_query(limit, offset)
 
-        all_path = "".join([self.path, classifier_id, "/_all?", urlencode(params)])
+        all_path = f"{self.path}{classifier_id}/_all{query}"
 
         response = self.do_request(all_path, method="GET")
 
-        if "ok" in response and not response["ok"]:
-            raise TextRazorAnalysisException("TextRazor was unable to retrieve categories for classifier id: %s, Error: %s" % (classifier_id, str(response)))
+        _raise_for_error(response, "TextRazor was unable to retrieve categories for classifier id: %s, Error: %s", classifier_id)
 
         return AllCategoriesResponse(response["response"])
 
     def delete_category(self, classifier_id, category_id):
         """ Deletes a Category by ID. """
-        category_path = "".join([self.path, classifier_id, "/", category_id])
+        category_path = f"{self.path}{classifier_id}/{category_id}"
         self.do_request(category_path, method="DELETE")
 
     def get_category(self, classifier_id, category_id):
         """ Returns a Category by ID. """
-        category_path = "".join([self.path, classifier_id, "/", category_id])
+        category_path = f"{self.path}{classifier_id}/{category_id}"
 
         response = self.do_request(category_path, method="GET")
 
-        if "ok" in response and not response["ok"]:
-            raise TextRazorAnalysisException("TextRazor was unable to retrieve category for classifier id: %s, Error: %s" % (classifier_id, str(response)))
+        _raise_for_error(response, "TextRazor was unable to retrieve category for classifier id: %s, Error: %s", classifier_id)
 
         return Category(response["response"])
 
 class Account(object):
 
+    __slots__ = ("json",)
+
     def __init__(self, json):
         self.json = json
 
@@ -1364,8 +1810,7 @@ class AccountManager(TextRazorConnection):
 
         response = self.do_request(self.path, method="GET")
 
-        if "ok" in response and not response["ok"]:
-            raise TextRazorAnalysisException("TextRazor was unable to retrieve your account details, Error: %s" % str(response))
+        _raise_for_error(response, "TextRazor was unable to retrieve your account details, Error: %s")
 
         return Account(response["response"])
 
@@ -1398,9 +1843,25 @@ class TextRazor(TextRazorConnection):
     >>>         seen.add(entity.id)
     """
 
+    # set_do_cleanup_HTML only warns about its deprecation the first time it's called.
+    _cleanup_html_warned = False
+
+    # The list options can be changed in place without an assignment, so a copy of them is kept
+    # with the encoded options and compared before each request.
+    _LIST_OPTIONS = ("extractors", "enrichment_queries", "dbpedia_type_filters", "freebase_type_filters",
+                     "entity_dictionaries", "classifiers")
+
+    # Assigning any of these drops the encoded options.
+    _OPTIONS = frozenset(_LIST_OPTIONS + (
+        "cleanup_html", "cleanup_mode", "cleanup_return_cleaned", "cleanup_return_raw", "cleanup_use_metadata",
+        "download_user_agent", "rules", "language_override", "allow_overlap", "classifier_max_categories"))
+
     def __init__(self, api_key=None, extractors=[], do_compression=None, do_encryption=None):
         super(TextRazor, self).__init__(api_key, do_compression, do_encryption)
 
+        self._encoded_options = None
+        self._encoded_lists = None
+
         self.extractors = extractors
         self.cleanup_html = False
         self.cleanup_mode = None
@@ -1418,6 +1879,19 @@ class TextRazor(TextRazorConnection):
         self.classifiers = []
         self.classifier_max_categories = None
 
+        # Raw response bodies of recent analyze calls keyed by a digest of the request, oldest
+        # first.  Off unless set_response_cache_size is called.
+        self._response_cache = None
+        self._response_cache_size = 0
+        self._response_cache_lock = None
+
+    def __setattr__(self, name, value):
+        # The request options are encoded once and reused across requests, any change to them
+        # (through the setters or directly) drops the encoded copy.
+        object.__setattr__(self, name, value)
+        if name in self._OPTIONS:
+            object.__setattr__(self, "_encoded_options", None)
+
     def set_extractors(self, extractors):
         """Sets a list of "Extractors" which extract various information from your text.
         Only select the extractors that are explicitly required by your application for optimal performance.
@@ -1448,7 +1922,9 @@ class TextRazor(TextRazorConnection):
         with the text content, providing access to the raw filtered text.  When enabled, position offsets returned
         in individual words apply to the clean text, not the provided HTML."""
 
-        warnings.warn("set_do_cleanup_HTML has been deprecated. Please see set_cleanup_mode for a more flexible cleanup option.", DeprecationWarning)
+        if not TextRazor._cleanup_html_warned:
+            TextRazor._cleanup_html_warned = True
+            warnings.warn("set_do_cleanup_HTML has been deprecated. Please see set_cleanup_mode for a more flexible cleanup option.", DeprecationWarning, stacklevel=2)
 
         self.cleanup_html = cleanup_html
 
@@ -1529,6 +2005,16 @@ class TextRazor(TextRazorConnection):
         """Sets the maximum number of matching categories to retrieve from the TextRazor."""
         self.classifier_max_categories = max_categories
 
+    def set_response_cache_size(self, size):
+        """Keeps the responses to the last size distinct analyze/analyze_url requests, so that
+        analyzing the same text or url again with the same settings doesn't go back to TextRazor.
+        Useful for corpora with repeated titles or boilerplate.  Defaults to 0, no caching."""
+        # The lock has to be in place before a cache is, analyze may be running on other threads.
+        if self._response_cache_lock is None:
+            self._response_cache_lock = threading.Lock()
+        self._response_cache_size = size
+        self._response_cache = OrderedDict() if size > 0 else None
+
     def _add_optional_param(self, post_data, param, value):
         if value is not None:
             post_data.append((param, value))
@@ -1539,17 +2025,10 @@ class TextRazor(TextRazorConnection):
                      ("cleanupHTML", self.cleanup_html),
                      ("classifiers", ",".join(self.classifiers))]
 
-        for dictionary in self.entity_dictionaries:
-            post_data.append(("entities.dictionaries", dictionary))
-
-        for filter in self.dbpedia_type_filters:
-            post_data.append(("entities.filterDbpediaTypes", filter))
-
-        for filter in self.freebase_type_filters:
-            post_data.append(("entities.filterFreebaseTypes", filter))
-
-        for query in self.enrichment_queries:
-            post_data.append(("entities.enrichmentQueries", query))
+        post_data.extend(("entities.dictionaries", dictionary) for dictionary in self.entity_dictionaries)
+        post_data.extend(("entities.filterDbpediaTypes", filter) for filter in self.dbpedia_type_filters)
+        post_data.extend(("entities.filterFreebaseTypes", filter) for filter in self.freebase_type_filters)
+        post_data.extend(("entities.enrichmentQueries", query) for query in self.enrichment_queries)
 
         self._add_optional_param(post_data, "entities.allowOverlap", self.allow_overlap)
         self._add_optional_param(post_data, "languageOverride", self.language_override)
@@ -1562,6 +2041,45 @@ class TextRazor(TextRazorConnection):
 
         return post_data
 
+    def _get_encoded_options(self):
+        lists = [tuple(getattr(self, name)) for name in self._LIST_OPTIONS]
+
+        encoded_options = self._encoded_options
+        if encoded_options is None or lists != self._encoded_lists:
+            encoded_options = self._encoded_options = urlencode(self._build_post_data()).encode("ascii")
+            self._encoded_lists = lists
+        return encoded_options
+
+    def _analyze(self, post_data):
+        cache = self._response_cache
+        if cache is None:
+            return self.do_request("", post_data, method="POST")
+
+        # The body holds every option as well as the text.  The api key and server aren't part of
+        # it, so they go into the digest too, a response is never reused for another account or
+        # server.
+        endpoint = self.secure_endpoint if self.do_encryption else self.endpoint
+        digest = blake2b(str(self.api_key).encode("utf-8"), digest_size=16)
+        digest.update(b"\0" + endpoint.encode("utf-8") + b"\0")
+        digest.update(post_data)
+        key = digest.digest()
+
+        with self._response_cache_lock:
+            body = cache.get(key)
+            if body is not None:
+                cache.move_to_end(key)
+
+        if body is None:
+            body = self._request_body("", post_data, method="POST")
+
+            with self._response_cache_lock:
+                cache[key] = body
+                while len(cache) > self._response_cache_size:
+                    cache.popitem(last=False)
+
+        # Each call gets its own parse, responses are free to be modified by the caller.
+        return _json_loads(body)
+
     def analyze_url(self, url):
         """Calls the TextRazor API with the provided url.
 
@@ -1577,18 +2095,73 @@ class TextRazor(TextRazorConnection):
         Returns a :class:`TextRazorResponse` with the parsed data on success.
         Raises a :class:`TextRazorAnalysisException` on failure. """
 
-        post_data = self._build_post_data()
-        post_data.append(("url", url.encode("utf-8")))
+        post_data = b"".join((self._get_encoded_options(), b"&url=", _quote_plus(url)))
+
+        return TextRazorResponse(self._analyze(post_data))
+
+    def analyze_urls(self, urls, max_workers=_MAX_CONCURRENT_REQUESTS):
+        """Calls :meth:`analyze_url` for each of the provided urls, with up to max_workers requests
+        in flight at once over the shared connection pool.
 
-        return TextRazorResponse(self.do_request("", urlencode(post_data), method="POST"))
+        Returns a list of :class:`TextRazorResponse`, in the same order as urls.
+        Raises a :class:`TextRazorAnalysisException` if any of the requests fails. """
+
+        return _map_concurrently(self.analyze_url, urls, max_workers)
+
+    def analyze_url_future(self, url):
+        """Starts :meth:`analyze_url` in the background and returns a :class:`concurrent.futures.Future`
+        that resolves to its :class:`TextRazorResponse`, or raises its exception. """
+
+        return _get_executor().submit(self.analyze_url, url)
 
     def analyze(self, text):
         """Calls the TextRazor API with the provided unicode text.
 
+        Text that is already UTF-8 encoded, such as the contents of a file, can be passed as bytes
+        to save encoding it again.
+
         Returns a :class:`TextRazorResponse` with the parsed data on success.
         Raises a :class:`TextRazorAnalysisException` on failure. """
 
-        post_data = self._build_post_data()
-        post_data.append(("text", text.encode("utf-8")))
+        # The text can be up to a megabyte, so it's quoted directly and added to the already
+        # encoded options without going through urlencode.
+        post_data = b"".join((self._get_encoded_options(), b"&text=", _quote_plus(text)))
+
+        return TextRazorResponse(self._analyze(post_data))
+
+    def analyze_raw(self, text):
+        """Calls the TextRazor API with the provided text like :meth:`analyze`, but returns the parsed
+        JSON response as plain dicts and lists without building any of the annotation classes.
+
+        This is the lowest overhead way to analyze text, for callers that read a field or two of
+        each response and don't need the links between annotations.
+
+        Raises a :class:`TextRazorAnalysisException` on failure. """
+
+        post_data = b"".join((self._get_encoded_options(), b"&text=", _quote_plus(text)))
+
+        return self._analyze(post_data)
+
+    def analyze_future(self, text):
+        """Starts :meth:`analyze` in the background and returns a :class:`concurrent.futures.Future`
+        that resolves to its :class:`TextRazorResponse`, or raises its exception.
+
+        Requests from every client share a small pool of worker threads, so many documents can be
+        submitted at once and are sent a few at a time.
+
+        >>> futures = [client.analyze_future(text) for text in texts]
+        >>> responses = [future.result() for future in futures]
+        """
+
+        return _get_executor().submit(self.analyze, text)
+
+    def analyze_batch(self, texts, max_workers=_MAX_CONCURRENT_REQUESTS):
+        """Calls :meth:`analyze` for each of the provided unicode texts, with up to max_workers requests
+        in flight at once over the shared connection pool.
+
+        >>> responses = client.analyze_batch(["First document.", "Second document."])
+
+        Returns a list of :class:`TextRazorResponse`, in the same order as texts.
+        Raises a :class:`TextRazorAnalysisException` if any of the requests fails. """
 
-        return TextRazorResponse(self.do_request("", urlencode(post_data), method="POST"))
+        return _map_concurrently(self.analyze, texts, max_workers)